@@ -1,38 +1,168 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import os  # <-- added
+import sys
+
+# Put this folder first on sys.path so cricbuzz_data imports however the app is launched.
+# Streamlit re-executes this file on every rerun, so only add it once.
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+from cricbuzz_data import MATCH_COLUMNS, clean_matches, read_table, read_table_head
 
 # --------------------------
 # Load Data
 # --------------------------
 @st.cache_data
-def load_data():
-    base_path = os.path.dirname(__file__)  # Ensures correct folder reference
-    matches = pd.read_csv(os.path.join(base_path, "cricbuzz_matches.csv"))
-    teams   = pd.read_csv(os.path.join(base_path, "teams.csv"))
-    series  = pd.read_csv(os.path.join(base_path, "series.csv"))
-    venues  = pd.read_csv(os.path.join(base_path, "venues.csv"))
-    
-    # Ensure expected columns exist
-    expected_cols = ['Venue', 'City', 'Team 1', 'Team 2', 'Series', 'Match Category', 'Start Date', 'Toss Winner']
-    for col in expected_cols:
-        if col not in matches.columns:
-            matches[col] = None  # Add missing columns with None
-    
-    # Convert Start Date safely
-    matches['Start Date'] = pd.to_datetime(matches['Start Date'], errors='coerce')
-    
-    return matches, teams, series, venues
-
-matches, teams, series, venues = load_data()
-
-# Dictionary for easy table selection
+def load_matches():
+    return clean_matches(read_table("cricbuzz_matches.csv", MATCH_COLUMNS))
+
+@st.cache_data
+def load_match_preview(rows=20):
+    # Previews show every column, so only the first rows are read at full width
+    return clean_matches(read_table_head("cricbuzz_matches.csv", rows))
+
+@st.cache_data
+def load_teams():
+    return read_table("teams.csv")
+
+@st.cache_data
+def load_series():
+    return read_table("series.csv")
+
+@st.cache_data
+def load_venues():
+    return read_table("venues.csv")
+
+# --------------------------
+# Counting Helpers
+# --------------------------
+def code_counts(column):
+    # np.bincount over the categorical's int codes (-1 marks missing values)
+    codes = column.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+    return pd.Series(counts, index=column.cat.categories).sort_values(ascending=False, kind='stable')
+
+# --------------------------
+# Cached Aggregates
+# --------------------------
+# Only the top rows are kept, so the unused tail never crosses the cache boundary
+@st.cache_data
+def city_counts(matches):
+    counts = matches['City'].value_counts().head(30).reset_index()
+    counts.columns = ['City', 'Matches']
+    return counts
+
+@st.cache_data
+def venue_counts(matches):
+    counts = matches['Venue'].value_counts().head(30).reset_index()
+    counts.columns = ['Venue', 'Matches']
+    return counts
+
+@st.cache_data
+def series_counts(matches):
+    counts = matches['Series'].value_counts().head(30).reset_index()
+    counts.columns = ['Series', 'Matches']
+    return counts
+
+@st.cache_data
+def toss_counts(matches):
+    counts = code_counts(matches['Toss Winner']).head(30)
+    return counts.rename_axis('Toss Winner').reset_index(name='Count')
+
+@st.cache_data
+def all_team_counts(matches):
+    # Recode both categorical columns onto a shared set of teams and bincount the int codes
+    teams = matches['Team 1'].cat.categories.union(matches['Team 2'].cat.categories)
+    codes = np.concatenate([
+        pd.Categorical(matches['Team 1'], categories=teams).codes,
+        pd.Categorical(matches['Team 2'], categories=teams).codes,
+    ])
+    counts = np.bincount(codes[codes >= 0], minlength=len(teams))
+    counts = pd.Series(counts, index=teams).sort_values(ascending=False, kind='stable').head(50)
+    return counts.rename_axis('Team').reset_index(name='Matches Played')
+
+@st.cache_data
+def matches_per_year(matches):
+    years = matches['Start Date'].dt.year.dropna().astype(np.int16).to_numpy()
+    if years.size == 0:
+        return pd.DataFrame({'Year': [], 'Matches': []})
+    first, last = years.min(), years.max()
+    counts = np.bincount(years - first, minlength=last - first + 1)
+    return pd.DataFrame({'Year': np.arange(first, last + 1), 'Matches': counts})
+
+@st.cache_data
+def category_counts(matches):
+    counts = code_counts(matches['Match Category']).head(30)
+    return counts.rename_axis('Match Category').reset_index(name='Count')
+
+# --------------------------
+# Cached Figures
+# --------------------------
+@st.cache_data
+def fig_matches_by_category(matches):
+    fig = px.bar(
+        category_counts(matches),
+        x='Match Category',
+        y='Count',
+        title="Matches by Category"
+    )
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_matches_by_city(matches):
+    fig = px.bar(city_counts(matches), x='City', y='Matches', title="Matches by City")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_top_teams(matches):
+    fig = px.bar(all_team_counts(matches).head(10), x='Team', y='Matches Played', title="Top 10 Teams by Matches Played")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_matches_over_years(matches):
+    fig = px.line(matches_per_year(matches), x='Year', y='Matches', markers=True, title="Matches Over Years")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_top_venues(matches):
+    fig = px.pie(venue_counts(matches).head(10), names='Venue', values='Matches', hole=0.4, title="Top 10 Venues")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_top_series(matches):
+    fig = px.pie(series_counts(matches).head(10), names='Series', values='Matches', hole=0.4, title="Top 10 Series")
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+@st.cache_data
+def fig_matches_by_toss_winner(matches):
+    return px.bar(toss_counts(matches).head(10), x='Toss Winner', y='Count', title="Matches by Toss Winner")
+
+@st.cache_data
+def fig_matches_by_venue(matches):
+    return px.bar(venue_counts(matches).head(10), x='Venue', y='Matches', title="Matches by Venue")
+
+@st.cache_data
+def fig_matches_per_team(matches):
+    team_detailed_counts = all_team_counts(matches).rename(columns={'Matches Played': 'Total Matches'})
+    fig = px.scatter(team_detailed_counts, x='Team', y='Total Matches', size='Total Matches', title="Matches per Team (Detailed)", render_mode='webgl')
+    fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
+    return fig
+
+# Dictionary for easy table selection (loaders are only called for the chosen table)
 data_tables = {
-    "Matches": matches,
-    "Teams": teams,
-    "Series": series,
-    "Venues": venues
+    "Matches": load_match_preview,
+    "Teams": load_teams,
+    "Series": load_series,
+    "Venues": load_venues
 }
 
 # --------------------------
@@ -44,15 +174,18 @@ page = st.sidebar.radio("Go to", ["Home", "KPIs & Metrics", "Visualizations", "U
 # --------------------------
 # Helper for Title Styling
 # --------------------------
+st.markdown(
+    """
+    <style>
+        .title-banner { background-color: #001F54; padding: 15px; border-radius: 10px; }
+        .title-banner h1 { text-align: center; color: white; }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
+
 def styled_title(text):
-    st.markdown(
-        f"""
-        <div style='background-color: #001F54; padding: 15px; border-radius: 10px;'>
-            <h1 style='text-align: center; color: white;'>{text}</h1>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(f"<div class='title-banner'><h1>{text}</h1></div>", unsafe_allow_html=True)
 
 # --------------------------
 # HOME PAGE
@@ -84,17 +217,24 @@ if page == "Home":
 # --------------------------
 elif page == "KPIs & Metrics":
     styled_title("KPIs & Metrics")
+    matches = load_matches()
 
     # KPI Metrics
     total_matches = len(matches)
-    total_teams = len(teams)
-    total_series = len(series)
-    total_venues = len(venues)
+    total_teams = len(load_teams())
+    total_series = len(load_series())
+    total_venues = len(load_venues())
 
-    most_played_venue = matches['Venue'].mode()[0] if matches['Venue'].notnull().any() else "N/A"
-    upcoming_matches = matches[matches['Match Category'].str.lower() == 'upcoming'].shape[0] if matches['Match Category'].notnull().any() else 0
-    live_matches = matches[matches['Match Category'].str.lower() == 'live'].shape[0] if matches['Match Category'].notnull().any() else 0
-    recent_matches = matches[matches['Match Category'].str.lower() == 'recent'].shape[0] if matches['Match Category'].notnull().any() else 0
+    top_venues = venue_counts(matches)
+    most_played_venue = top_venues['Venue'].iloc[0] if len(top_venues) else "N/A"
+    has_category = matches['Match Category'].notna().any()
+    # Compare int codes directly; the source CSV stores categories in lowercase
+    category_codes = matches['Match Category'].cat.codes.to_numpy()
+    code_of = {category: code for code, category in enumerate(matches['Match Category'].cat.categories)}
+    upcoming_matches, live_matches, recent_matches = (
+        int((category_codes == code_of[category]).sum()) if category in code_of else 0
+        for category in ['upcoming', 'live', 'recent']
+    )
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Matches", total_matches)
@@ -110,30 +250,26 @@ elif page == "KPIs & Metrics":
 
     # Quick Stats Table
     st.markdown("### Quick Match Stats")
-    st.dataframe(matches.head(10))
+    st.dataframe(load_match_preview().iloc[:10], width='stretch', hide_index=True)
 
     # Select Table to Display
     st.markdown("### Explore Other Tables")
-    table_choice = st.selectbox("Choose a Table", list(data_tables.keys()))
-    if st.button("Generate Table"):
-        st.write(f"### {table_choice} Table")
-        st.dataframe(data_tables[table_choice].head(20))
+
+    # Fragment: the selectbox and button only rerun this block, not the whole page
+    @st.fragment
+    def table_explorer():
+        table_choice = st.selectbox("Choose a Table", list(data_tables.keys()))
+        if st.button("Generate Table"):
+            table = data_tables[table_choice]()  # cached, only loaded once picked
+            st.write(f"### {table_choice} Table")
+            st.dataframe(table.iloc[:20], width='stretch', hide_index=True)
+
+    table_explorer()
 
     # KPI Visualization
     st.markdown("### KPI Visualization - Matches by Category")
-    if matches['Match Category'].notnull().any():
-        category_counts = matches['Match Category'].value_counts().reset_index()
-        category_counts.columns = ['Match Category', 'Count']
-        fig = px.bar(
-            category_counts,
-            x='Match Category',
-            y='Count',
-            color='Count',
-            color_continuous_scale='blues',
-            title="Matches by Category"
-        )
-        fig.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-        st.plotly_chart(fig, use_container_width=True)
+    if has_category:
+        st.plotly_chart(fig_matches_by_category(matches), use_container_width=True)
 
 # --------------------------
 # VISUALIZATIONS
@@ -141,57 +277,31 @@ elif page == "KPIs & Metrics":
 elif page == "Visualizations":
     styled_title("Visualizations")
     st.markdown("### Cricket Insights Visualizations")
+    matches = load_matches()
 
     # Matches by City
-    city_counts = matches['City'].value_counts().reset_index()
-    city_counts.columns = ['City', 'Matches']
-    fig1 = px.bar(city_counts, x='City', y='Matches', color='Matches', title="Matches by City", color_continuous_scale='Viridis')
-    fig1.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig1, use_container_width=True)
+    st.plotly_chart(fig_matches_by_city(matches), use_container_width=True)
 
     # Top 10 Teams by Matches Played
-    team_counts = pd.concat([matches['Team 1'], matches['Team 2']]).value_counts().reset_index()
-    team_counts.columns = ['Team', 'Matches Played']
-    fig2 = px.bar(team_counts.head(10), x='Team', y='Matches Played', color='Matches Played', title="Top 10 Teams by Matches Played", color_continuous_scale='Plasma')
-    fig2.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig2, use_container_width=True)
+    st.plotly_chart(fig_top_teams(matches), use_container_width=True)
 
     # Matches Over Years
-    over_years = matches.groupby(matches['Start Date'].dt.year).size().reset_index(name='Matches')
-    fig3 = px.line(over_years, x='Start Date', y='Matches', markers=True, title="Matches Over Years")
-    fig3.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(fig_matches_over_years(matches), use_container_width=True)
 
     # Top 10 Venues
-    venue_counts = matches['Venue'].value_counts().reset_index()
-    venue_counts.columns = ['Venue', 'Matches']
-    fig4 = px.pie(venue_counts.head(10), names='Venue', values='Matches', hole=0.4, title="Top 10 Venues")
-    fig4.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig4, use_container_width=True)
+    st.plotly_chart(fig_top_venues(matches), use_container_width=True)
 
     # Top 10 Series
-    series_counts = matches['Series'].value_counts().reset_index()
-    series_counts.columns = ['Series', 'Matches']
-    fig5 = px.pie(series_counts.head(10), names='Series', values='Matches', hole=0.4, title="Top 10 Series")
-    fig5.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig5, use_container_width=True)
+    st.plotly_chart(fig_top_series(matches), use_container_width=True)
 
     # Matches by Toss Winner
-    toss_counts = matches['Toss Winner'].value_counts().reset_index()
-    toss_counts.columns = ['Toss Winner', 'Count']
-    fig6 = px.bar(toss_counts.head(10), x='Toss Winner', y='Count', color='Count', title="Matches by Toss Winner", color_continuous_scale='Sunset')
-    st.plotly_chart(fig6, use_container_width=True)
+    st.plotly_chart(fig_matches_by_toss_winner(matches), use_container_width=True)
 
     # Matches by Venue
-    fig7 = px.bar(venue_counts.head(10), x='Venue', y='Matches', color='Matches', title="Matches by Venue", color_continuous_scale='Magma')
-    st.plotly_chart(fig7, use_container_width=True)
+    st.plotly_chart(fig_matches_by_venue(matches), use_container_width=True)
 
     # Matches per Team (Detailed)
-    team_detailed_counts = pd.concat([matches['Team 1'], matches['Team 2']]).value_counts().reset_index()
-    team_detailed_counts.columns = ['Team', 'Total Matches']
-    fig8 = px.scatter(team_detailed_counts, x='Team', y='Total Matches', size='Total Matches', color='Total Matches', title="Matches per Team (Detailed)")
-    fig8.update_layout(plot_bgcolor='white', paper_bgcolor='white', font_color='black')
-    st.plotly_chart(fig8, use_container_width=True)
+    st.plotly_chart(fig_matches_per_team(matches), use_container_width=True)
 
 # --------------------------
 # USER PROFILE
@@ -0,0 +1,83 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+import os
+
+# --------------------------
+# Shared table loading and cleaning
+# Used by app.py at runtime and by prepare.py to write the Parquet copies.
+# --------------------------
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_PATH, "data")
+TABLES = ["cricbuzz_matches.csv", "teams.csv", "series.csv", "venues.csv"]
+
+# Match columns used by the KPI and Visualizations pages
+CATEGORY_COLUMNS = ['Venue', 'City', 'Team 1', 'Team 2', 'Series', 'Match Category', 'Toss Winner']
+MATCH_COLUMNS = CATEGORY_COLUMNS + ['Start Date']
+
+
+def csv_path(filename):
+    return os.path.join(BASE_PATH, filename)
+
+
+def parquet_path(filename):
+    return os.path.join(DATA_PATH, os.path.splitext(filename)[0] + ".parquet")
+
+
+def read_csv(filename, columns=None):
+    if columns is None:
+        return pd.read_csv(csv_path(filename), engine='pyarrow', dtype_backend='pyarrow')
+    # Only parse the requested columns; any missing from the file come back as null columns
+    convert_options = pv.ConvertOptions(
+        include_columns=columns,
+        include_missing_columns=True,
+        column_types={col: pa.string() for col in CATEGORY_COLUMNS if col in columns},
+    )
+    table = pv.read_csv(csv_path(filename), convert_options=convert_options)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def parquet_is_fresh(filename):
+    # A Parquet copy written by prepare.py is only used while it is newer than the CSV
+    parquet = parquet_path(filename)
+    return os.path.exists(parquet) and os.path.getmtime(parquet) >= os.path.getmtime(csv_path(filename))
+
+
+def read_table(filename, columns=None):
+    if parquet_is_fresh(filename):
+        return pd.read_parquet(parquet_path(filename), engine='pyarrow', columns=columns)
+    return read_csv(filename, columns)
+
+
+def read_table_head(filename, rows):
+    # Only the first batch is read and converted, never the whole table
+    if parquet_is_fresh(filename):
+        batch = next(pq.ParquetFile(parquet_path(filename)).iter_batches(batch_size=rows), None)
+        if batch is not None:
+            return batch.to_pandas()
+        return pd.read_parquet(parquet_path(filename), engine='pyarrow')
+    with pv.open_csv(csv_path(filename)) as reader:
+        batch = next(iter(reader), None)
+        table = pa.Table.from_batches([batch] if batch is not None else [], schema=reader.schema)
+    return table.slice(0, rows).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def clean_matches(matches):
+    # Ensure expected columns exist (full-width reads don't add the missing ones)
+    existing_cols = set(matches.columns)
+    for col in MATCH_COLUMNS:
+        if col not in existing_cols:
+            matches[col] = None  # Add missing columns with None
+
+    # Convert Start Date safely (stored as epoch integers, which parse_dates can't handle)
+    if not pd.api.types.is_datetime64_dtype(matches['Start Date']):
+        matches['Start Date'] = pd.to_datetime(matches['Start Date'], errors='coerce')
+
+    # Low-cardinality text columns as categoricals (grouping runs on int codes).
+    # Prepared Parquet columns skip this, except all-null ones that Parquet stores untyped.
+    for col in CATEGORY_COLUMNS:
+        if not isinstance(matches[col].dtype, pd.CategoricalDtype):
+            matches[col] = matches[col].astype('category')
+
+    return matches
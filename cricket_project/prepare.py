@@ -0,0 +1,21 @@
+import os
+
+from cricbuzz_data import BASE_PATH, DATA_PATH, TABLES, clean_matches, parquet_path, read_csv
+
+# --------------------------
+# One-shot CSV -> Parquet preprocessing
+# Run `python prepare.py` after updating the CSVs; app.py reads the
+# Parquet copies in data/ when they are newer than their CSV.
+# --------------------------
+def main():
+    os.makedirs(DATA_PATH, exist_ok=True)
+    for filename in TABLES:
+        df = read_csv(filename)
+        if filename == "cricbuzz_matches.csv":
+            df = clean_matches(df)  # full width: the previews read every column
+        df.to_parquet(parquet_path(filename), engine='pyarrow', compression='zstd')
+        print(f"{filename} -> {os.path.relpath(parquet_path(filename), BASE_PATH)}")
+
+
+if __name__ == "__main__":
+    main()